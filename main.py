@@ -1,13 +1,120 @@
+import io
+
 import numpy as np
+import openpyxl
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit as st
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
 from scipy.stats import f as f_dist
 
 from utils.dispersion_analysis import get_groups_from_df, perform_dispers_analysis
 from utils.dynamic_programming import compute_replacement_plan, extract_rs_from_df
 from utils.risk_analysis import build_risk_matrix, calculate_danger
 
+
+try:
+    import python_calamine  # noqa: F401
+
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+
+# Строки, которые pd.read_excel по умолчанию считает пропусками
+_NA_STRINGS = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+})
+
+
+def _convert_cell(cell):
+    """Приводит значение ячейки openpyxl так же, как это делает pandas."""
+    value = cell.value
+    if cell.data_type == TYPE_ERROR:
+        return None
+    if cell.data_type == TYPE_NUMERIC and value is not None:
+        return int(value) if int(value) == value else float(value)
+    if isinstance(value, str) and value in _NA_STRINGS:
+        return None
+    return value
+
+
+def _dedup_columns(names: list) -> list:
+    """Переименовывает повторяющиеся заголовки как pandas: a, a.1, a.2, ..."""
+    counts: dict = {}
+    result = []
+    for name in names:
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[name] = count + 1
+            name = f"{name}.{count}"
+            count = counts.get(name, 0)
+        counts[name] = count + 1
+        result.append(name)
+    return result
+
+
+def _load_xlsx(data: bytes, header: int | None = 0) -> pd.DataFrame:
+    """Читает активный лист .xlsx через openpyxl в режиме read_only, минуя pandas."""
+    wb = openpyxl.load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        # Размеры листа из файла могут учитывать отформатированные пустые ячейки
+        ws.reset_dimensions()
+        rows = []
+        for row in ws.rows:
+            values = [_convert_cell(cell) for cell in row]
+            # Отбрасываем пустые ячейки в конце строки
+            while values and values[-1] is None:
+                values.pop()
+            rows.append(values)
+    finally:
+        wb.close()
+    # Отбрасываем пустые строки в конце листа
+    while rows and not rows[-1]:
+        rows.pop()
+    # Выравниваем строки по самой длинной
+    width = max((len(values) for values in rows), default=0)
+    rows = [values + [None] * (width - len(values)) for values in rows]
+    if header is None:
+        df = pd.DataFrame(rows)
+    # Пустой лист: pd.read_excel в этом случае возвращает пустой DataFrame
+    elif header >= len(rows):
+        return pd.DataFrame()
+    else:
+        columns = _dedup_columns([
+            f"Unnamed: {i}" if name is None else name
+            for i, name in enumerate(rows[header])
+        ])
+        df = pd.DataFrame(rows[header + 1:], columns=columns)
+    # Пропуски в object-колонках pandas хранит как NaN, а не None
+    return df.replace({None: np.nan})
+
+
+@st.cache_data(show_spinner=False)
+def _read_excel(data: bytes, header: int | None = 0) -> pd.DataFrame:
+    """Читает Excel файл из байтов; результат кэшируется по содержимому файла."""
+    if HAS_CALAMINE:
+        return pd.read_excel(io.BytesIO(data), header=header, engine="calamine")
+    if data[:2] == b"PK":  # .xlsx — zip-архив
+        return _load_xlsx(data, header=header)
+    return pd.read_excel(io.BytesIO(data), header=header)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_dispers(groups: list[np.ndarray]) -> dict:
+    """Кэшируемая обёртка над perform_dispers_analysis."""
+    return perform_dispers_analysis(groups)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_dp(r: np.ndarray, s: np.ndarray, P: float, t0: int) -> dict:
+    """Кэшируемая обёртка над compute_replacement_plan."""
+    return compute_replacement_plan(r, s, P, t0)
+
+
 # Настройка страницы
 st.set_page_config(page_title="Моделирование и анализ принятия решений", layout="wide")
 st.title("Моделирование и анализ принятия решений")
@@ -27,13 +134,13 @@ with tab1:
     )
     if uploaded_file1 is not None:
         try:
-            df1: pd.DataFrame = pd.read_excel(uploaded_file1)
+            df1: pd.DataFrame = _read_excel(uploaded_file1.getvalue())
             st.dataframe(df1)
 
             # Подготовка данных и расчет dispers
             groups = get_groups_from_df(df1)
             if len(groups) >= 2:
-                result = perform_dispers_analysis(groups)
+                result = _cached_dispers(groups)
 
                 # Отображение результатов
                 st.subheader("Результаты дисперсионного анализа:")
@@ -92,15 +199,16 @@ with tab1:
                     )
 
                 # Визуализация распределения F
-                x = np.linspace(
-                    0,
-                    max(
-                        result["F"] * 1.5,
-                        f_dist.ppf(0.95, result["df_between"], result["df_within"]),  # type: ignore
-                    ),
-                    200,
+                # Плотность в точке F считаем тем же вызовом, что и кривую
+                f_value = result["F"]
+                dfs = (result["df_between"], result["df_within"])
+                xs = np.append(
+                    np.linspace(0, max(f_value * 1.5, result["F_crit"]), 200),
+                    f_value,
                 )
-                y = f_dist.pdf(x, result["df_between"], result["df_within"])
+                ys = f_dist.pdf(xs, *dfs)
+                x, y = xs[:-1], ys[:-1]
+                f_pdf_at_value = ys[-1]
 
                 fig = go.Figure()
                 fig.add_trace(
@@ -108,10 +216,6 @@ with tab1:
                 )
 
                 # Добавляем маркер и вертикальную линию для фактического значения F
-                f_value = result["F"]
-                f_pdf_at_value = f_dist.pdf(
-                    f_value, result["df_between"], result["df_within"]
-                )
                 fig.add_vline(
                     x=f_value,
                     line=dict(dash="dash"),
@@ -159,7 +263,7 @@ with tab2:
     )
     if uploaded_file2 is not None:
         try:
-            df2: pd.DataFrame = pd.read_excel(uploaded_file2)
+            df2: pd.DataFrame = _read_excel(uploaded_file2.getvalue())
             st.subheader("Исходные данные")
             st.dataframe(df2)
 
@@ -188,7 +292,7 @@ with tab3:
     )
     if uploaded_file3 is not None:
         try:
-            df3: pd.DataFrame = pd.read_excel(uploaded_file3, header=None)
+            df3: pd.DataFrame = _read_excel(uploaded_file3.getvalue(), header=None)
             st.subheader("Исходные данные (две строки: прибыль r(t) и остаточная стоимость s(t))")
             st.dataframe(df3)
 
@@ -207,17 +311,13 @@ with tab3:
             )
             if st.button("Рассчитать план", key="calc_dp"):
                 try:
-                    result_dp = compute_replacement_plan(r, s, P, t0)
+                    result_dp = _cached_dp(r, s, P, t0)
                     st.subheader("Максимальная прибыль")
                     st.write(f"**{result_dp['total_profit']:.2f}**")
 
                     st.subheader("Оптимальный план замены графического ядра")
                     df_plan = pd.DataFrame(result_dp['plan'])
                     st.table(df_plan)
-
-                    # st.subheader("Таблица Беллмана (F)")
-                    # df_F = pd.DataFrame(result_dp['F'])
-                    # st.dataframe(df_F)
                 except Exception as e:
                     st.error(f"Ошибка при расчете: {e}")
         except Exception as e:
@@ -1,46 +1,55 @@
 import numpy as np
-from scipy.stats import f
+from scipy.special import fdtri
+from scipy.stats import f_oneway
 import pandas as pd
 
 
-def get_groups_from_df(df: pd.DataFrame) -> list[list[float]]:
+def get_groups_from_df(df: pd.DataFrame) -> list[np.ndarray]:
     """
     Преобразует DataFrame в список групп для dispers_analysis.
     Каждая колонка DataFrame считается отдельной группой, пропуская пустые и нечисловые значения.
     """
-    groups = []
-    for col in df.columns:
-        # Отфильтровать ненулевые и нечисловые значения
-        series = pd.to_numeric(df[col], errors='coerce').dropna()
-        if not series.empty:
-            groups.append(series.tolist())
-    return groups
+    # Приводим все колонки к числу за один проход
+    numeric = df.apply(pd.to_numeric, errors='coerce')
+    return [
+        col.dropna().to_numpy(dtype=np.float64, copy=False)
+        for _, col in numeric.items()
+        if col.notna().any()
+    ]
 
 
-def perform_dispers_analysis(data: list[list[float]]) -> dict:
+def perform_dispers_analysis(data: list[np.ndarray]) -> dict:
     """
     Выполняет однофакторный дисперсионный анализ (dispers_analysis) для заданных групп.
     Возвращает словарь с результатами расчёта:
     SS, df, MS, F-статистика, p-значение и прочее.
+    Все скалярные значения возвращаются как обычные float/int Python.
     """
     # Фильтруем пустые группы
-    data = [group for group in data if len(group) > 0]
-    k = len(data)  # количество групп
+    arrs = [np.asarray(group, dtype=np.float64) for group in data if len(group)]
+    k = len(arrs)  # количество групп
     if k < 2:
         raise ValueError("Для dispers_analysis требуется как минимум две группы данных.")
 
-    # Число наблюдений в каждой группе (предполагается одинаковое)
-    n_list = [len(group) for group in data]
+    # Число наблюдений в каждой группе
+    n_arr = np.fromiter((a.size for a in arrs), dtype=np.int64, count=k)
+    n_list = n_arr.tolist()
     # Общие наблюдения
-    N = sum(n_list)
+    N = int(n_arr.sum())
+    if N <= k:
+        raise ValueError(
+            "Для dispers_analysis требуется хотя бы одна группа с двумя и более наблюдениями."
+        )
 
     # Вычисляем средние
-    group_means = [np.mean(group) for group in data]
-    total_mean = np.mean([x for group in data for x in group])
+    means = np.fromiter((a.mean() for a in arrs), dtype=np.float64, count=k)
+    group_means = means.tolist()
+    all_vals = np.concatenate(arrs)
+    total_mean = float(all_vals.mean())
 
     # Суммы квадратов
-    SS_total = sum((x - total_mean) ** 2 for group in data for x in group)
-    SS_between = sum(len(group) * (mean - total_mean) ** 2 for group, mean in zip(data, group_means))
+    SS_total = float(((all_vals - total_mean) ** 2).sum())
+    SS_between = float((n_arr * (means - total_mean) ** 2).sum())
     SS_within = SS_total - SS_between
 
     # Степени свободы
@@ -54,11 +63,11 @@ def perform_dispers_analysis(data: list[list[float]]) -> dict:
     MS_total = SS_total / df_total
 
     # F-статистика и p-значение
-    F_stat = MS_between / MS_within
-    p_value = 1 - f.cdf(F_stat, df_between, df_within)
+    F_stat, p_value = f_oneway(*arrs)
+    F_stat, p_value = float(F_stat), float(p_value)
 
     alpha = 0.05
-    F_crit = f.ppf(1 - alpha, df_between, df_within)
+    F_crit = float(fdtri(df_between, df_within, 1 - alpha))
 
     return {
         'SS_total': SS_total,
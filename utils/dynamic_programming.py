@@ -1,80 +1,101 @@
 import numpy as np
 import pandas as pd
+from numba import njit
 
+# Коды решений в матрице decisions
+KEEP, REPLACE = 0, 1  # хранятся как np.int8
+DECISION_LABELS = ("Оставить", "Заменить")
 
-def extract_rs_from_df(df: pd.DataFrame) -> tuple[list[float], list[float]]:
+
+def extract_rs_from_df(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
     """
-    Из DataFrame без заголовков (две строки) извлекает два списка:
+    Из DataFrame без заголовков (две строки) извлекает два массива:
     r (доходы) и s (остаточная стоимость).
     Ожидается DataFrame с shape=(2, n)
     """
     if df.shape[0] != 2 or df.shape[1] < 2:
         raise ValueError("Неверный формат данных: ожидается 2 строки и минимум 2 столбца.")
-    r = [float(x) for x in df.iloc[0].tolist()]
-    s = [float(x) for x in df.iloc[1].tolist()]
+    r = df.iloc[0].to_numpy(dtype=np.float64)
+    s = df.iloc[1].to_numpy(dtype=np.float64)
     return r, s
 
 
-def compute_replacement_plan(r: list[float], s: list[float], P: float, t0: int) -> dict:
+@njit(cache=True)
+def _dp_core(
+    r: np.ndarray, s: np.ndarray, P: float, n_years: int, max_age: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Заполняет матрицу решений (коды KEEP/REPLACE) и возвращает её вместе
+    с последней строкой таблицы Беллмана F[n_years].
+    Стадия k зависит только от k-1, поэтому храним лишь две строки F.
+    Компилируется numba; восстановление плана выполняется в Python.
+    """
+    # Инициализация
+    F_prev = np.zeros(max_age + 1)
+    F_curr = np.zeros(max_age + 1)
+    decisions = np.zeros((n_years + 1, max_age + 1), dtype=np.int8)  # KEEP
+
+    # k = 1 (последний год)
+    for t in range(max_age):
+        F_prev[t] = r[t]
+    F_prev[max_age] = s[max_age] - P + r[0]
+    decisions[1, max_age] = REPLACE
+
+    # k = 2..n_years
+    for k in range(2, n_years + 1):
+        for t in range(max_age + 1):
+            # Заменить
+            replace_value = s[t] - P + r[0] + F_prev[1]
+            # Оставить (в предельном возрасте невозможно)
+            if t < max_age and r[t] + F_prev[t+1] >= replace_value:
+                F_curr[t] = r[t] + F_prev[t+1]
+            else:
+                F_curr[t] = replace_value
+                decisions[k, t] = REPLACE
+        F_prev, F_curr = F_curr, F_prev
+
+    return F_prev, decisions
+
+
+def compute_replacement_plan(r: np.ndarray, s: np.ndarray, P: float, t0: int) -> dict:
     """
     Алгоритм замены оборудования (динамическое программирование).
-    r: список доходов по возрастам (len = max_age+1)
-    s: список остаточной стоимости по возрастам (len = max_age+1)
+    r: массив доходов по возрастам (len = max_age+1)
+    s: массив остаточной стоимости по возрастам (len = max_age+1)
     P: стоимость нового оборудования
     t0: начальный возраст оборудования
 
     Возвращает dict с ключами:
         total_profit: float
         plan: list[dict] с ключами 'year', 'decision', 'age'
-        F: np.ndarray (таблица Беллмана)
-        decisions: np.ndarray (матрица решений)
+        decisions: np.ndarray (матрица решений, коды KEEP/REPLACE)
     """
+    r = np.asarray(r, dtype=np.float64)
+    s = np.asarray(s, dtype=np.float64)
+    # _dp_core компилируется numba без проверки границ массивов
+    if r.ndim != 1 or len(r) < 2:
+        raise ValueError("Неверный формат данных: r должен содержать минимум 2 значения.")
+    if s.shape != r.shape:
+        raise ValueError("Неверный формат данных: длины r и s должны совпадать.")
     max_age = len(r) - 1
     n_years = len(r) - 1
+    if not 0 <= t0 <= max_age:
+        raise ValueError(f"Неверный начальный возраст: ожидается 0 <= t0 <= {max_age}.")
 
-    # Инициализация
-    F = np.zeros((n_years + 1, max_age + 1))
-    decisions = np.empty((n_years + 1, max_age + 1), dtype=object)
-
-    # k = 1 (последний год)
-    for t in range(max_age + 1):
-        if t < max_age:
-            F[1][t] = r[t]
-            decisions[1][t] = "Оставить"
-        else:
-            F[1][t] = s[t] - P + r[0]
-            decisions[1][t] = "Заменить"
-
-    # k = 2..n_years
-    for k in range(2, n_years + 1):
-        for t in range(max_age + 1):
-            # keep
-            if t < max_age:
-                keep_value = r[t] + F[k-1][t+1]
-            else:
-                keep_value = -np.inf
-            # Заменить
-            replace_value = s[t] - P + r[0] + F[k-1][1]
-            # choose
-            if keep_value >= replace_value:
-                F[k][t] = keep_value
-                decisions[k][t] = "Оставить"
-            else:
-                F[k][t] = replace_value
-                decisions[k][t] = "Заменить"
+    F_last, decisions = _dp_core(r, s, float(P), n_years, max_age)
 
     # Восстановление плана
     plan = []
     current_age = t0
-    total_profit = F[n_years][current_age]
+    total_profit = float(F_last[current_age])
     for k in range(n_years, 0, -1):
-        decision = decisions[k][current_age]
+        code = decisions[k, current_age]
         plan.append({
             'Год': n_years - k + 1,
-            'Решение': decision,
+            'Решение': DECISION_LABELS[code],
             'Возраст': current_age
         })
-        if decision == "Заменить":
+        if code == REPLACE:
             current_age = 1
         else:
             current_age += 1
@@ -82,6 +103,5 @@ def compute_replacement_plan(r: list[float], s: list[float], P: float, t0: int)
     return {
         'total_profit': total_profit,
         'plan': plan,
-        'F': F,
         'decisions': decisions
     }
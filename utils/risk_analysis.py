@@ -1,30 +1,34 @@
 import pandas as pd
 import numpy as np
-from collections import defaultdict
 import plotly.graph_objects as go
 import plotly.express as px
 
+# Подписи блоков шкалы 1–10 (по два значения в блоке)
+_BIN_LABELS = tuple(f"{i * 2 + 1}–{i * 2 + 2}" for i in range(5))
+_BIN_LABELS_REV = _BIN_LABELS[::-1]
+
 
 def calculate_danger(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Добавляет в DataFrame столбец 'Опасность' = Ущерб * Вероятность для валидных строк.
+    Возвращает DataFrame с колонками 'Код', 'Ущерб', 'Вероятность' и
+    'Опасность' = Ущерб * Вероятность для валидных строк.
     Ожидаемые колонки: 'Код', 'Ущерб', 'Вероятность'.
     Значения 1 <= Ущерб, Вероятность <= 10.
     """
-    df = df.copy()
     # Приводим к числу и фильтруем
-    df["Ущерб"] = pd.to_numeric(df["Ущерб"], errors="coerce")
-    df["Вероятность"] = pd.to_numeric(df["Вероятность"], errors="coerce")
-    # Убираем название
-    df = df.drop("Название риска", axis=1)
-    # Вычисляем Опасность
-    df["Опасность"] = df.apply(
-        lambda row: row["Ущерб"] * row["Вероятность"]
-        if 1 <= row["Ущерб"] <= 10 and 1 <= row["Вероятность"] <= 10
-        else np.nan,
-        axis=1,
+    d = pd.to_numeric(df["Ущерб"], errors="coerce").to_numpy()
+    p = pd.to_numeric(df["Вероятность"], errors="coerce").to_numpy()
+    valid = (d >= 1) & (d <= 10) & (p >= 1) & (p <= 10)
+    # Собираем только нужные колонки, не копируя весь исходный DataFrame
+    return pd.DataFrame(
+        {
+            "Код": df["Код"].to_numpy(),
+            "Ущерб": d,
+            "Вероятность": p,
+            "Опасность": np.where(valid, d * p, np.nan),
+        },
+        index=df.index,
     )
-    return df
 
 
 def build_risk_matrix(df: pd.DataFrame) -> go.Figure:
@@ -41,30 +45,23 @@ def build_risk_matrix(df: pd.DataFrame) -> go.Figure:
     if risks.empty:
         raise ValueError("Нет валидных данных для построения матрицы рисков.")
 
-    # Сетка уровней ущерба и вероятности
-    damage_vals = np.arange(1, 11)
-    prob_vals = np.arange(1, 11)
-    damage_grid, prob_grid = np.meshgrid(damage_vals, prob_vals)
-    risk_levels = damage_grid * prob_grid
-
-    # Среднее в блоках 2x2 => матрица 5x5
-    avg_matrix = np.zeros((5, 5))
-    for i in range(5):
-        for j in range(5):
-            block = risk_levels[i * 2 : (i + 1) * 2, j * 2 : (j + 1) * 2]
-            avg_matrix[i, j] = np.mean(block)
+    # Среднее Ущерб * Вероятность в блоках 2x2 сетки 10x10 => матрица 5x5.
+    # Среднее произведения по блоку равно произведению средних по осям:
+    # (2i + 1.5) * (2j + 1.5)
+    block_means = 2 * np.arange(5) + 1.5
+    avg_matrix = np.outer(block_means, block_means)
 
     # Группируем коды по блокам
-    cell_labels = defaultdict(list)
-    for _, row in risks.iterrows():
-        x_bin = (int(row["Ущерб"]) - 1) // 2
-        y_bin = (int(row["Вероятность"]) - 1) // 2
-        cell_labels[(y_bin, x_bin)].append(str(row["Код"]))  # y, x order for heatmap
+    x_bin = (risks["Ущерб"].astype(int).to_numpy() - 1) // 2
+    y_bin = (risks["Вероятность"].astype(int).to_numpy() - 1) // 2
+    codes = risks["Код"].astype(str).to_numpy()
+    cell_labels = pd.Series(codes).groupby(y_bin * 5 + x_bin).agg("<br>".join)
 
     # Создаем текст для ячеек
     text_matrix = [["" for _ in range(5)] for _ in range(5)]
-    for (y, x), codes in cell_labels.items():
-        text_matrix[y][x] = "<br>".join(codes)
+    for key, label in cell_labels.items():
+        y, x = divmod(int(key), 5)  # y, x order for heatmap
+        text_matrix[y][x] = label
 
     # Построение heatmap
     # Используем цветовую шкалу RdYlGn, но перевернутую
@@ -76,8 +73,8 @@ def build_risk_matrix(df: pd.DataFrame) -> go.Figure:
             texttemplate="%{text}",
             textfont=dict(size=12),
             hoverinfo="text+z",
-            x=[f"{i * 2 + 1}–{i * 2 + 2}" for i in range(5)],
-            y=[f"{i * 2 + 1}–{i * 2 + 2}" for i in range(5)][::-1],
+            x=_BIN_LABELS,
+            y=_BIN_LABELS_REV,
             colorscale=colors,
             zmin=0,
             zmax=100,
@@ -92,13 +89,13 @@ def build_risk_matrix(df: pd.DataFrame) -> go.Figure:
             title="Ущерб",
             tickmode="array",
             tickvals=list(range(5)),
-            ticktext=[f"{i * 2 + 1}–{i * 2 + 2}" for i in range(5)], 
+            ticktext=_BIN_LABELS,
         ),
         yaxis=dict(
             title="Вероятность",
             tickmode="array",
             tickvals=list(range(5)),
-            ticktext=[f"{i * 2 + 1}–{i * 2 + 2}" for i in range(5)][::-1],
+            ticktext=_BIN_LABELS_REV,
         ),
         width=700,
         height=700,